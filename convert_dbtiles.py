@@ -35,12 +35,12 @@ def convert(input_path: Path, output_path: Path) -> None:
                 continue
             coords.append(parsed)
 
-    with output_path.open("w", encoding="utf-8") as dest:
-        dest.write("Coordinate[] path = {\n")
-        for i, (x, y, plane) in enumerate(coords):
-            trailing = "," if i < len(coords) - 1 else ""
-            dest.write(f"    new Coordinate({x}, {y}, {plane}){trailing}\n")
-        dest.write("};\n")
+    # Format once and write once: a single join sizes the output in one allocation
+    # instead of one write() call (and trailing-comma branch) per coordinate.
+    body = ",\n".join(f"    new Coordinate({x}, {y}, {plane})" for x, y, plane in coords)
+    if body:
+        body += "\n"
+    output_path.write_text(f"Coordinate[] path = {{\n{body}}};\n", encoding="utf-8")
 
 
 def main() -> None:
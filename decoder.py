@@ -3,11 +3,13 @@
 import argparse
 import base64
 import binascii
+import contextlib
 import json
 import re
 import sqlite3
+import struct
 import sys
-from typing import List, Tuple
+from typing import List, TextIO, Tuple
 
 def _maybe_hex_text_to_bytes(b: bytes) -> bytes:
     """
@@ -61,16 +63,46 @@ def _maybe_hex_text_to_bytes(b: bytes) -> bytes:
     return b
 
 
+_TRIPLET_LE_I32 = struct.Struct("<3i")
+
+
 def decode_triplets_le_i32(buf: bytes) -> List[Tuple[int, int, int]]:
-    if len(buf) % 12 != 0:
+    if len(buf) % _TRIPLET_LE_I32.size != 0:
         raise ValueError(f"Blob length {len(buf)} is not a multiple of 12 bytes.")
-    pts = []
-    for i in range(0, len(buf), 12):
-        x = int.from_bytes(buf[i:i+4], "little", signed=True)
-        y = int.from_bytes(buf[i+4:i+8], "little", signed=True)
-        plane = int.from_bytes(buf[i+8:i+12], "little", signed=True)
-        pts.append((x, y, plane))
-    return pts
+    # One C-level pass over the blob instead of three slice + int.from_bytes per point.
+    return list(_TRIPLET_LE_I32.iter_unpack(buf))
+
+
+def _write_rows(out: TextIO, fmt: str, decoded_rows) -> None:
+    if fmt == "json":
+        json.dump([
+            {
+                "entrance_from": entrance_from,
+                "entrance_to": entrance_to,
+                "points": [
+                    {"x": x, "y": y, "plane": plane}
+                    for x, y, plane in points
+                ],
+            }
+            for entrance_from, entrance_to, points in decoded_rows
+        ], out, indent=2)
+    elif fmt == "csv":
+        out.write("entrance_from,entrance_to,x,y,plane")
+        for entrance_from, entrance_to, points in decoded_rows:
+            if points:
+                for x, y, plane in points:
+                    out.write(f"\n{entrance_from},{entrance_to},{x},{y},{plane}")
+            else:
+                out.write(f"\n{entrance_from},{entrance_to},,,")
+    else:
+        for i, (entrance_from, entrance_to, points) in enumerate(decoded_rows):
+            if i:
+                out.write("\n\n")
+            out.write(f"Coordinate[] path_from_{entrance_from}_to_{entrance_to} = {{\n")
+            if points:
+                out.write(",\n".join(f"    new Coordinate({x}, {y}, {plane})" for x, y, plane in points))
+                out.write("\n")
+            out.write("};")
 
 
 def main():
@@ -91,73 +123,44 @@ def main():
         raise ValueError("Table name must contain only letters, numbers, or underscores.")
 
     with sqlite3.connect(args.database) as conn:
-        conn.row_factory = sqlite3.Row
+        # Larger page cache + mmap'd reads for the blob scan (connection-local, read-only use).
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
         query = f"SELECT entrance_from, entrance_to, path_blob FROM {args.table}"
         params = []
         if args.entrance_from is not None:
             query += " WHERE entrance_from = ?"
             params.append(args.entrance_from)
         query += " ORDER BY entrance_from, entrance_to"
-        rows = conn.execute(query, params).fetchall()
 
-    if not rows:
-        raise ValueError("No rows found matching the given criteria.")
-
-    decoded_rows = []
-    for row in rows:
-        raw_blob = row["path_blob"]
-        if raw_blob is None:
-            points = []
-        else:
-            if isinstance(raw_blob, memoryview):
-                raw_blob = raw_blob.tobytes()
-            if isinstance(raw_blob, str):
-                raw_blob = raw_blob.encode("utf-8")
-            if isinstance(raw_blob, bytearray):
-                raw_blob = bytes(raw_blob)
-            points = decode_triplets_le_i32(_maybe_hex_text_to_bytes(raw_blob))
-        decoded_rows.append((row["entrance_from"], row["entrance_to"], points))
-
-    if args.format == "json":
-        out_text = json.dumps([
-            {
-                "entrance_from": entrance_from,
-                "entrance_to": entrance_to,
-                "points": [
-                    {"x": x, "y": y, "plane": plane}
-                    for x, y, plane in points
-                ],
-            }
-            for entrance_from, entrance_to, points in decoded_rows
-        ], indent=2)
-    elif args.format == "csv":
-        lines = ["entrance_from,entrance_to,x,y,plane"]
-        for entrance_from, entrance_to, points in decoded_rows:
-            if points:
-                for x, y, plane in points:
-                    lines.append(f"{entrance_from},{entrance_to},{x},{y},{plane}")
+        # Decode while stepping the cursor rather than fetchall()-ing every raw blob
+        # first, so raw and decoded rows are never both held in full. Rows are plain
+        # tuples unpacked in the loop header (no sqlite3.Row wrapper / name lookups).
+        decoded_rows = []
+        for entrance_from, entrance_to, raw_blob in conn.execute(query, params):
+            if raw_blob is None:
+                points = []
             else:
-                lines.append(f"{entrance_from},{entrance_to},,,")
-        out_text = "\n".join(lines)
-    else:
-        blocks = []
-        for entrance_from, entrance_to, points in decoded_rows:
-            header = (
-                f"Coordinate[] path_from_{entrance_from}_to_{entrance_to} = {{"
-            )
-            if points:
-                body_lines = [f"    new Coordinate({x}, {y}, {plane})" for x, y, plane in points]
-                block = "\n".join([header, ",\n".join(body_lines), "};"])
-            else:
-                block = "\n".join([header, "};"])
-            blocks.append(block)
-        out_text = "\n\n".join(blocks)
+                if isinstance(raw_blob, memoryview):
+                    raw_blob = raw_blob.tobytes()
+                if isinstance(raw_blob, str):
+                    raw_blob = raw_blob.encode("utf-8")
+                if isinstance(raw_blob, bytearray):
+                    raw_blob = bytes(raw_blob)
+                points = decode_triplets_le_i32(_maybe_hex_text_to_bytes(raw_blob))
+            decoded_rows.append((entrance_from, entrance_to, points))
+
+    if not decoded_rows:
+        raise ValueError("No rows found matching the given criteria.")
 
-    if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(out_text)
-    else:
-        print(out_text)
+    # Stream straight to the destination: json.dump writes encoder chunks as they are
+    # produced, and the text formats write per row, so the full output text is never
+    # held in memory at once.
+    with (open(args.output, "w", encoding="utf-8") if args.output
+          else contextlib.nullcontext(sys.stdout)) as out:
+        _write_rows(out, args.format, decoded_rows)
+        if not args.output:
+            out.write("\n")
 
 
 if __name__ == "__main__":
@@ -1,48 +1,50 @@
 #!/usr/bin/env python3
-import json
+from itertools import chain, groupby
 from pathlib import Path
 
+try:
+    # Optional: orjson parses large route responses several times faster.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 INPUT = Path("result.json")
 OUTPUT = Path("results_parsed.json")
 
 def to_tuple(coord_dict):
-    # Prefer "min" if present (your data has min==max)
-    if isinstance(coord_dict, dict) and "min" in coord_dict:
-        return tuple(coord_dict["min"])
-    # Fallback if already a list/tuple
-    return tuple(coord_dict)
+    # Prefer "min" if present (your data has min==max). That is the shape of every
+    # action, so try it directly and only pay for the fallback when it is absent.
+    try:
+        coords = coord_dict["min"]
+    except (KeyError, TypeError):
+        # Fallback if already a list/tuple
+        return tuple(coord_dict)
+    return tuple(coords)
 
 def main():
-    data = json.loads(INPUT.read_text(encoding="utf-8"))
-    actions = data.get("actions", [])
-
-    points = []
-    if actions:
-        first_from = actions[0].get("from")
-        if first_from:
-            points.append(to_tuple(first_from))
-
-        for a in actions:
-            to_pt = a.get("to")
-            if to_pt:
-                points.append(to_tuple(to_pt))
-
-    # Dedupe consecutive duplicates
-    deduped = []
-    for pt in points:
-        if not deduped or deduped[-1] != pt:
-            deduped.append(pt)
-
-    # Build Java code
-    java_lines = ["Coordinate[] path = {"]
-    for i, (x, y, z) in enumerate(deduped):
-        comma = "," if i < len(deduped) - 1 else ""
-        java_lines.append(f"    new Coordinate({x}, {y}, {z}){comma}")
-    java_lines.append("};")
-    java_code = "\n".join(java_lines)
-
-    OUTPUT.write_text(java_code + "\n", encoding="utf-8")
-    print(f"Wrote {OUTPUT} with {len(deduped)} points.")
+    data = json_loads(INPUT.read_bytes())  # both loaders validate UTF-8 in C; skip the str decode
+    actions = data.get("actions") or []
+
+    # Single fused pass: points are produced lazily, deduped and formatted as they
+    # stream through; the only materialised list is the final output lines.
+    first_from = actions[0].get("from") if actions else None
+    points = chain(
+        (to_tuple(first_from),) if first_from else (),
+        (to_tuple(to_pt) for a in actions if (to_pt := a.get("to"))),
+    )
+    # Dedupe consecutive duplicates only (groupby collapses each run in C). Repeats that
+    # are not adjacent are real revisits (e.g. back out through a door) and must stay.
+    lines = [f"    new Coordinate({x}, {y}, {z})" for (x, y, z), _ in groupby(points)]
+
+    # Write Java code straight to the file (1 MiB buffer). The ",\n" separator join
+    # handles the trailing comma, so there is no per-line last-element branch.
+    with OUTPUT.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write("Coordinate[] path = {\n")
+        if lines:
+            f.write(",\n".join(lines))
+            f.write("\n")
+        f.write("};\n")
+    print(f"Wrote {OUTPUT} with {len(lines)} points.")
 
 if __name__ == "__main__":
     main()